@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+import whatsapp_script as ws
+
+CHAT = (Path(__file__).parent / 'data' / 'chat.txt').read_bytes()
+
+# The same chat as the fixture, with the byte-level variations real exports come with
+VARIANTS = {
+    'plain': CHAT,
+    'bom': b'\xef\xbb\xbf' + CHAT,
+    'crlf': CHAT.replace(b'\n', b'\r\n'),
+    'no_final_newline': CHAT.rstrip(b'\n'),
+    'bom_crlf_no_final_newline': b'\xef\xbb\xbf' + CHAT.replace(b'\n', b'\r\n').rstrip(b'\r\n'),
+    'empty': b'',
+}
+
+
+def _reference_messages(data):
+    """Parses `data` line by line with `_parse_message`, the original pure Python parser."""
+    lines = data.decode('utf-8-sig').split('\n')
+    parsed = [ws._parse_message(line.removesuffix('\r')) for line in lines]
+    return [message for message in parsed if message != (None, None, None)]
+
+
+def _rows(df):
+    return list(df[['Timestamp', 'Sender', 'Content']].itertuples(index=False, name=None))
+
+
+@pytest.fixture(params=VARIANTS)
+def chat_file(request, tmp_path):
+    path = tmp_path / f'{request.param}.txt'
+    path.write_bytes(VARIANTS[request.param])
+    return path
+
+
+def test_arrow_parser_matches_parse_message(chat_file):
+    assert _rows(ws._load_messages_arrow(chat_file)) == _reference_messages(chat_file.read_bytes())
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 64])
+def test_arrow_parser_chunking_matches_parse_message(chat_file, chunk_size, monkeypatch):
+    monkeypatch.setattr(ws, '_CHUNK_SIZE', chunk_size)
+    assert _rows(ws._load_messages_arrow(chat_file)) == _reference_messages(chat_file.read_bytes())
+
+
+def test_numba_parser_matches_parse_message(chat_file):
+    if ws.numba is None:
+        pytest.skip('numba is not installed')
+    assert _rows(ws._load_messages_numba(chat_file)) == _reference_messages(chat_file.read_bytes())
+
+
+def test_fixture_parses_expected_messages():
+    assert len(_reference_messages(CHAT)) == 7
+
+
+@pytest.mark.parametrize('use_hyperscan', [True, False])
+def test_count_words_usage_matches_count_word_usage(tmp_path, use_hyperscan, monkeypatch):
+    if use_hyperscan and ws.hyperscan is None:
+        pytest.skip('hyperscan is not installed')
+    if not use_hyperscan:
+        monkeypatch.setattr(ws, 'hyperscan', None)
+
+    path = tmp_path / 'chat.txt'
+    path.write_bytes(CHAT)
+    df = ws.load_chat_data(path)
+
+    words = ['', '(?=m)me', 'me', 'ME', 'see', 'happy|late', 'absent']
+    results = ws.count_words_usage(words, df)
+
+    assert list(results) == words
+    for word in words:
+        pd.testing.assert_frame_equal(results[word], ws.count_word_usage(word, df), obj=repr(word))